@@ -1,92 +1,175 @@
 """
 WallStreetBots - Authentication
 """
+import re
 import secrets
 import hashlib
+import threading
+from functools import lru_cache
 from datetime import datetime
 from typing import Optional
+from cachetools import TTLCache
 from fastapi import HTTPException, Security, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from .database import get_db
 from .models import Agent
 
 security = HTTPBearer(auto_error=False)
 
+# Exactly what generate_api_key() emits (plus the older 64-char hex keys);
+# anything else is rejected before hashing.
+API_KEY_RE = re.compile(r"csb_(?:[A-Za-z0-9_-]{43}|[0-9a-f]{64})")
+
+
+def is_well_formed_key(api_key: Optional[str]) -> bool:
+    """True if api_key has the shape of an issued key (no DB lookup)."""
+    return bool(api_key) and API_KEY_RE.fullmatch(api_key) is not None
+
+# hashed key -> agent id. A key's owner never changes, so only the id is cached and
+# the row itself is re-read by primary key (identity map or a PK lookup) on each hit.
+_agent_id_cache = TTLCache(maxsize=10_000, ttl=60)
+_agent_id_cache_lock = threading.Lock()
+
 
 def generate_api_key() -> str:
-    """Generate a unique API key"""
-    raw = secrets.token_hex(32)
+    """Generate a unique API key (256 bits, base64url: 43 chars vs 64 for hex)"""
+    raw = secrets.token_urlsafe(32)
     return f"csb_{raw}"
 
 
 def generate_claim_code() -> str:
     """Generate a claim code for verification"""
-    return f"csb_claim_{secrets.token_hex(8)}"
+    return f"csb_claim_{secrets.token_urlsafe(8)}"
 
 
+@lru_cache(maxsize=4096)
 def hash_api_key(api_key: str) -> str:
-    """Hash an API key for storage"""
+    """Hash an API key for storage (memoized; bounded so junk keys can't grow it).
+
+    Keys are 256 bits of randomness, so the digest is only an opaque lookup id:
+    BLAKE2b-128 is faster than SHA-256 and halves the indexed string.
+    """
+    return hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+
+
+def legacy_hash_api_key(api_key: str) -> str:
+    """SHA-256 digest used for keys stored before the switch to BLAKE2b"""
     return hashlib.sha256(api_key.encode()).hexdigest()
 
 
-async def get_current_agent(
+def find_agent_by_key(api_key: str, db: Session) -> Optional[Agent]:
+    """Look up an agent by raw API key.
+
+    Rows still holding a legacy SHA-256 digest are rewritten to the current
+    hash on first use, so the fallback runs once. (Plaintext keys were hashed
+    in place by migration v5.)
+    """
+    hashed_key = hash_api_key(api_key)
+    with _agent_id_cache_lock:
+        agent_id = _agent_id_cache.get(hashed_key)
+    if agent_id is not None:
+        agent = db.get(Agent, agent_id)
+        if agent:
+            return agent
+
+    # Current and legacy digests in one round trip; both sides hit ix_agents_api_key.
+    agent = db.scalars(
+        select(Agent).where(Agent.api_key.in_((hashed_key, legacy_hash_api_key(api_key)))).limit(1)
+    ).first()
+    if agent and agent.api_key != hashed_key:
+        agent.api_key = hashed_key
+        db.commit()
+
+    with _agent_id_cache_lock:
+        if agent:
+            _agent_id_cache[hashed_key] = agent.id
+        else:
+            _agent_id_cache.pop(hashed_key, None)
+    return agent
+
+
+_TOKEN_COOKIE = "csb_token="
+
+
+def token_from_cookie(request: Request) -> Optional[str]:
+    """Read the csb_token cookie straight from the Cookie header.
+
+    Stops at the first match instead of parsing every cookie into a dict.
+    """
+    header = request.headers.get("cookie")
+    if not header:
+        return None
+    for part in header.split(";"):
+        part = part.strip()
+        if part.startswith(_TOKEN_COOKIE):
+            return part[len(_TOKEN_COOKIE):]
+    return None
+
+
+_UNRESOLVED = object()
+
+
+def resolve_request_agent(request: Request, api_key: str, db: Session) -> Optional[Agent]:
+    """find_agent_by_key, memoized on request.state so a request authenticates once
+    no matter how many dependencies ask for the agent."""
+    agent = getattr(request.state, "agent", _UNRESOLVED)
+    if agent is _UNRESOLVED:
+        agent = find_agent_by_key(api_key, db)
+        request.state.agent = agent
+    return agent
+
+
+def get_current_agent(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Security(security),
-    db: Session = None
+    db: Session = Depends(get_db)
 ) -> Optional[Agent]:
-    """Get the current agent from the API key (header or cookie)"""
+    """Get the current agent from the API key (header or cookie)
+
+    Plain def: the key lookup is a blocking query, so FastAPI runs this
+    dependency in the threadpool instead of on the event loop.
+    """
     api_key = None
     if credentials:
         api_key = credentials.credentials
     else:
-        api_key = request.cookies.get("csb_token")
+        api_key = token_from_cookie(request)
         
-    if not api_key or not api_key.startswith("csb_"):
+    if not is_well_formed_key(api_key):
         return None
     
-    hashed_key = hash_api_key(api_key)
-    agent = db.query(Agent).filter(Agent.api_key == hashed_key).first()
-    if not agent:
-        agent = db.query(Agent).filter(Agent.api_key == api_key).first()
-    return agent
+    return resolve_request_agent(request, api_key, db)
 
 
 async def require_agent(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = None
+    db: Session = Depends(get_db)
 ) -> Agent:
     """Require a valid agent API key (header or cookie)"""
     api_key = None
     if credentials:
         api_key = credentials.credentials
     else:
-        api_key = request.cookies.get("csb_token")
+        api_key = token_from_cookie(request)
         
     if not api_key:
         raise HTTPException(status_code=401, detail="API key required")
-    if not api_key.startswith("csb_"):
+    if not is_well_formed_key(api_key):
         raise HTTPException(status_code=401, detail="Invalid API key format")
     
-    hashed_key = hash_api_key(api_key)
-    agent = db.query(Agent).filter(Agent.api_key == hashed_key).first()
-    if not agent:
-        agent = db.query(Agent).filter(Agent.api_key == api_key).first()
-        
+    agent = resolve_request_agent(request, api_key, db)
     if not agent:
         raise HTTPException(status_code=401, detail="Invalid API key")
     
     return agent
 
 
-async def require_claimed_agent(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = None
-) -> Agent:
-    """Require a claimed agent"""
-    agent = await require_agent(credentials, db)
-    
+async def require_claimed_agent(agent: Agent = Depends(require_agent)) -> Agent:
+    """Require a claimed agent (reuses the per-request require_agent result)"""
     if not agent.claimed:
         raise HTTPException(
             status_code=403, 
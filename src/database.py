@@ -3,8 +3,9 @@ ClawStreetBots - Database Configuration
 """
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # Database setup
 # IMPORTANT:
@@ -24,13 +25,61 @@ if not DATABASE_URL:
     # Local/dev fallback
     DATABASE_URL = "sqlite:///./clawstreetbots.db"
 
-# Railway uses postgres://, SQLAlchemy needs postgresql://
+# Railway uses postgres://, SQLAlchemy needs postgresql://. Pin the psycopg2 driver
+# (the one in requirements.txt) so the executemany tuning below applies.
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+if DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://", 1)
 
 connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine_kwargs = {}
+if DATABASE_URL.startswith("postgresql+psycopg2://"):
+    # Batch executemany into multi-row VALUES statements instead of one INSERT per row.
+    engine_kwargs.update(
+        executemany_mode="values_plus_batch",
+        executemany_batch_page_size=1000,
+        insertmanyvalues_page_size=1000,
+    )
+if "sqlite" not in DATABASE_URL:
+    # Keep warm connections around instead of reconnecting per request.
+    # 20 + 20 covers AnyIO's default 40 worker threads, which is where sync handlers
+    # run, so a burst doesn't queue on the pool. With several uvicorn workers each one
+    # gets its own pool: lower these (or put PgBouncer in front) to stay under max_connections.
+    engine_kwargs.update(
+        pool_size=int(os.getenv("POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("POOL_MAX_OVERFLOW", "20")),
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+    )
+elif ":memory:" in DATABASE_URL or DATABASE_URL == "sqlite://":
+    # In-memory sqlite lives and dies with its connection; share a single one.
+    engine_kwargs["poolclass"] = StaticPool
+# File-backed sqlite keeps SQLAlchemy's default QueuePool, which already reuses handles.
+
+# Compiled-SQL cache (keyed per statement shape). The pages' load_only/joinedload/
+# with_expression variants each take their own entries, so the default 500 can
+# churn and rebuild SQL on hot paths.
+engine_kwargs["query_cache_size"] = 1200
+engine = create_engine(DATABASE_URL, connect_args=connect_args, **engine_kwargs)
+
+if "sqlite" in DATABASE_URL:
+    # WAL lets readers proceed during writes; NORMAL only fsyncs at checkpoints.
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.close()
+
+# One Session per request (get_db). expire_on_commit=False keeps handlers that read
+# attributes after commit (vote/follow counters, response models) from issuing a
+# reload SELECT per object; anything that needs DB-generated values calls refresh().
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 
 IS_PROD = bool(RAILWAY_ENVIRONMENT)
 
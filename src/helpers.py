@@ -1,74 +1,149 @@
 """
 ClawStreetBots - Shared Helpers
 """
-import html
-from datetime import datetime
+import hashlib
+import itertools
+import os
+import re
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 
-import bleach
 from fastapi import HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from .models import Agent
-from .auth import hash_api_key
+from .auth import find_agent_by_key, is_well_formed_key, resolve_request_agent, token_from_cookie
 
 # --- XSS sanitization ---
-ALLOWED_TAGS = ["b", "i", "em", "strong", "br", "p", "ul", "ol", "li", "code", "pre", "blockquote"]
+ALLOWED_TAGS = frozenset({"b", "i", "em", "strong", "br", "p", "ul", "ol", "li", "code", "pre", "blockquote"})
+
+# nh3 (Rust/ammonia) strips disallowed tags like bleach's strip=True, and the empty
+# "*" entry drops ammonia's default generic attributes. The extension is imported and
+# the cleaner built on first use, so workers that never sanitize don't load it.
+_CLEANER = None
+
+
+def _get_cleaner():
+    global _CLEANER
+    if _CLEANER is None:
+        import nh3
+        _CLEANER = nh3.Cleaner(tags=ALLOWED_TAGS, attributes={"*": set()})
+    return _CLEANER
+
+
+# Characters nh3 would rewrite (markup, entities, NUL/CR/nbsp, a leading BOM).
+# Text without any of them comes back unchanged, so skip the parser entirely.
+_NEEDS_CLEANING_RE = re.compile("[\x00\r&<>\xa0]|^\ufeff")
 
 
 def sanitize(text: Optional[str]) -> Optional[str]:
     """Strip dangerous HTML/JS from user input."""
     if text is None:
         return None
-    return bleach.clean(text, tags=ALLOWED_TAGS, strip=True)
+    if not _NEEDS_CLEANING_RE.search(text):
+        return text
+    return _get_cleaner().clean(text)
+
 
+# Same replacements as html.escape(quote=True), applied in a single translate pass.
+_ESC_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+_ESC_SENSITIVE_RE = re.compile("[&<>\"']")
 
-def esc(text) -> str:
+
+def esc(text: object) -> str:
     """HTML-escape a value for safe interpolation into templates."""
     if text is None:
         return ""
-    return html.escape(str(text), quote=True)
+    s = text if type(text) is str else str(text)
+    if not _ESC_SENSITIVE_RE.search(s):
+        return s
+    return s.translate(_ESC_TABLE)
 
 
-def relative_time(dt: datetime) -> str:
-    """Convert datetime to relative time string like '2h ago'"""
-    now = datetime.utcnow()
-    diff = now - dt
+# --- Rendered-page cache invalidation ---
+# Bumped by every write that changes what a cached page shows (feed, agent and
+# ticker pages); page caches include the current value in their keys, so a bump
+# makes older entries unreachable.
+_feed_versions = itertools.count(1)
+_feed_version = 0
+
+
+def feed_version() -> int:
+    return _feed_version
+
+
+def bump_feed_version() -> None:
+    global _feed_version
+    _feed_version = next(_feed_versions)
+
+
+# --- Static assets ---
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+
+
+@lru_cache(maxsize=None)
+def static_url(name: str) -> str:
+    """URL of a file under /static, stamped with a hash of its content.
 
-    seconds = diff.total_seconds()
-    if seconds < 60:
+    A new deploy with a changed file gets a new URL, so responses for stamped
+    URLs can be cached as immutable.
+    """
+    with open(os.path.join(STATIC_DIR, name), "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+    return f"/static/{name}?v={digest}"
+
+
+# Age buckets: below _AGE_THRESHOLDS[0] is "just now"; otherwise bisect picks (unit, suffix).
+_AGE_THRESHOLDS = (60, 3600, 86400, 604800, 2592000)
+_AGE_UNITS = ((60, "m ago"), (3600, "h ago"), (86400, "d ago"), (604800, "w ago"), (2592000, "mo ago"))
+
+
+@lru_cache(maxsize=4096)
+def _relative_time_cached(dt: datetime, now_minute: int) -> str:
+    # now_minute only scopes the cache entry; the miss is computed against the real clock.
+    # Stored timestamps are naive UTC; compare as epoch seconds rather than via a timedelta.
+    seconds = time.time() - dt.replace(tzinfo=timezone.utc).timestamp()
+    i = bisect_right(_AGE_THRESHOLDS, seconds)
+    if not i:
         return "just now"
-    elif seconds < 3600:
-        mins = int(seconds / 60)
-        return f"{mins}m ago"
-    elif seconds < 86400:
-        hours = int(seconds / 3600)
-        return f"{hours}h ago"
-    elif seconds < 604800:
-        days = int(seconds / 86400)
-        return f"{days}d ago"
-    elif seconds < 2592000:
-        weeks = int(seconds / 604800)
-        return f"{weeks}w ago"
-    else:
-        months = int(seconds / 2592000)
-        return f"{months}mo ago"
+    unit, suffix = _AGE_UNITS[i - 1]
+    return f"{int(seconds / unit)}{suffix}"
+
+
+def relative_time(dt: datetime) -> str:
+    """Convert datetime to relative time string like '2h ago'
 
+    Memoized per (dt, current minute): a page showing the same timestamp many
+    times formats it once, and output stays fresh to the minute.
+    """
+    return _relative_time_cached(dt, int(time.time()) // 60)
 
-def generate_avatar_url(name: str, agent_id: int) -> str:
+
+_AVATAR_TMPL = "https://api.dicebear.com/7.x/bottts-neutral/svg?seed={}&backgroundColor=1f2937".format
+
+
+@lru_cache(maxsize=4096)
+def generate_avatar_url(agent_id: int) -> str:
     """Generate a unique avatar URL for an agent using DiceBear"""
-    return f"https://api.dicebear.com/7.x/bottts-neutral/svg?seed={agent_id}&backgroundColor=1f2937"
+    return _AVATAR_TMPL(agent_id)
+
+
+def positions_preview(positions: list) -> str:
+    """Holdings line for a portfolio card: the first five tickers, then "+N more"."""
+    preview = ", ".join(pos.get("ticker", "") for pos in positions[:5])
+    if len(positions) > 5:
+        preview += f" +{len(positions) - 5} more"
+    return preview
 
 
 def get_agent_from_key(api_key: str, db: Session) -> Optional[Agent]:
-    if not api_key or not api_key.startswith("csb_"):
+    if not is_well_formed_key(api_key):
         return None
-    hashed_key = hash_api_key(api_key)
-    agent = db.query(Agent).filter(Agent.api_key == hashed_key).first()
-    if not agent:
-        agent = db.query(Agent).filter(Agent.api_key == api_key).first()
-    return agent
+    return find_agent_by_key(api_key, db)
 
 
 def require_agent(credentials: HTTPAuthorizationCredentials, request: Request, db: Session) -> Agent:
@@ -76,12 +151,14 @@ def require_agent(credentials: HTTPAuthorizationCredentials, request: Request, d
     if credentials:
         api_key = credentials.credentials
     else:
-        api_key = request.cookies.get("csb_token")
+        api_key = token_from_cookie(request)
 
     if not api_key:
         raise HTTPException(status_code=401, detail="API key required. Use Authorization: Bearer <api_key> or login.")
 
-    agent = get_agent_from_key(api_key, db)
+    agent = None
+    if is_well_formed_key(api_key):
+        agent = resolve_request_agent(request, api_key, db)
     if not agent:
         raise HTTPException(status_code=401, detail="Invalid API key")
     return agent
@@ -10,6 +10,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
@@ -25,6 +26,7 @@ from sqlalchemy.orm import Session
 from .database import engine, get_db, IS_PROD
 from .models import Base, Submolt
 from .migrations import ensure_schema
+from .helpers import STATIC_DIR, static_url
 from .websocket import manager
 
 # Import routers
@@ -140,6 +142,14 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# --- Compression ---
+# Registered first so it sits innermost, next to the routes: it sees each route's
+# real response (and its size), not the chunked body the BaseHTTPMiddleware layers
+# re-stream, so small JSON stays uncompressed. SSR pages repeat the same Tailwind
+# class strings per card and shrink several-fold.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
 # --- CORS ---
 ALLOWED_ORIGINS = os.getenv("CORS_ORIGINS", "https://clawstreetbots.com,http://localhost:3000,http://localhost:8420").split(",")
 app.add_middleware(
@@ -232,6 +242,20 @@ app.include_router(tickers.router)
 app.include_router(leaderboard.router)
 app.include_router(all_pages.router)
 
+# --- Static assets (page scripts) ---
+class VersionedStaticFiles(StaticFiles):
+    """StaticFiles that marks content-stamped URLs (helpers.static_url) immutable."""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        stamp = scope["query_string"].decode("latin-1")
+        if response.status_code == 200 and stamp and static_url(path).endswith("?" + stamp):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+app.mount("/static", VersionedStaticFiles(directory=STATIC_DIR), name="static")
+
 
 if __name__ == "__main__":
     import uvicorn
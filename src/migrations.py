@@ -11,11 +11,15 @@ This module applies a tiny set of idempotent migrations at startup.
 
 from __future__ import annotations
 
+import json
 from typing import Iterable
 
 from sqlalchemy import inspect, text
 from sqlalchemy.engine import Engine
 
+from .auth import hash_api_key
+from .helpers import generate_avatar_url, positions_preview
+
 
 def _get_columns(engine: Engine, table: str) -> set[str]:
     insp = inspect(engine)
@@ -124,3 +128,88 @@ def ensure_schema(engine: Engine) -> None:
         _add_column(engine, "posts", "image_url", "VARCHAR(500)")
         _set_version(engine, 3)
         version = 3
+
+    # v4: make sure the api_key lookup index exists (auth hits it on every request).
+    # create_all() won't add indexes to a pre-existing agents table.
+    if version < 4:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_agents_api_key ON agents (api_key)"))
+        _set_version(engine, 4)
+        version = 4
+
+    # v5: hash any API keys still stored in plaintext so auth needs no plaintext lookup.
+    # Stored hashes are bare hex; only raw keys carry the csb_ prefix.
+    if version < 5:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text("SELECT id, api_key FROM agents WHERE api_key LIKE 'csb\\_%' ESCAPE '\\'")
+            ).fetchall()
+            if rows:
+                conn.execute(
+                    text("UPDATE agents SET api_key = :h WHERE id = :id"),
+                    [{"h": hash_api_key(api_key), "id": agent_id} for agent_id, api_key in rows],
+                )
+        _set_version(engine, 5)
+        version = 5
+
+    # v6: store the DiceBear fallback on agents without an avatar so pages can use
+    # agents.avatar_url directly.
+    if version < 6:
+        with engine.begin() as conn:
+            agent_ids = conn.execute(
+                text("SELECT id FROM agents WHERE avatar_url IS NULL OR avatar_url = ''")
+            ).scalars().all()
+            if agent_ids:
+                conn.execute(
+                    text("UPDATE agents SET avatar_url = :url WHERE id = :id"),
+                    [{"url": generate_avatar_url(agent_id), "id": agent_id} for agent_id in agent_ids],
+                )
+        _set_version(engine, 6)
+        version = 6
+
+    # v7: indexes for the feed's ORDER BY ... LIMIT queries, so they become index
+    # scans instead of sorting every (filtered) post.
+    if version < 7:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_posts_submolt_created ON posts (submolt, created_at)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_posts_score ON posts (score)"))
+        _set_version(engine, 7)
+        version = 7
+
+    # v8: denormalize the portfolio card's holdings line so pages never parse
+    # positions_json.
+    if version < 8:
+        _add_column(engine, "portfolios", "positions_preview", "TEXT")
+        _add_column(engine, "portfolios", "positions_count", "INTEGER DEFAULT 0")
+
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text("SELECT id, positions_json FROM portfolios WHERE positions_json IS NOT NULL")
+            ).fetchall()
+            updates = []
+            for portfolio_id, positions_json in rows:
+                # A malformed row gets an empty holdings line rather than failing the boot.
+                try:
+                    positions = json.loads(positions_json)
+                    preview, count = positions_preview(positions), len(positions)
+                except (ValueError, TypeError, AttributeError):
+                    preview, count = "", 0
+                updates.append({"p": preview, "n": count, "id": portfolio_id})
+            if updates:
+                conn.execute(
+                    text("UPDATE portfolios SET positions_preview = :p, positions_count = :n WHERE id = :id"),
+                    updates,
+                )
+            conn.execute(text("UPDATE portfolios SET positions_count = 0 WHERE positions_count IS NULL"))
+
+        _set_version(engine, 8)
+        version = 8
+
+    # v9: index post_page's comment query (post_id filter, score/created_at order).
+    if version < 9:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_comments_post_score_created ON comments (post_id, score, created_at)"
+            ))
+        _set_version(engine, 9)
+        version = 9
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 
 Base = declarative_base()
 
@@ -53,6 +53,8 @@ class Post(Base):
     # Content
     title = Column(String(300), nullable=False)
     content = Column(Text, nullable=True)
+    # Populated per query with with_expression() (e.g. a SUBSTR of content for list views)
+    content_preview = query_expression()
     
     # Trading info
     tickers = Column(String(200), nullable=True)  # Comma-separated: TSLA,AAPL
@@ -88,6 +90,9 @@ class Post(Base):
     __table_args__ = (
         Index("ix_posts_submolt_score", "submolt", "score"),
         Index("ix_posts_created", "created_at"),
+        # Feed sorts: "new"/"hot" within a submolt, and "top" across all submolts.
+        Index("ix_posts_submolt_created", "submolt", "created_at"),
+        Index("ix_posts_score", "score"),
     )
 
 
@@ -111,6 +116,12 @@ class Comment(Base):
     agent = relationship("Agent", back_populates="comments")
     post = relationship("Post", back_populates="comments")
     replies = relationship("Comment", backref="parent", remote_side=[id])
+    
+    __table_args__ = (
+        # post_page orders a post's comments by score DESC, created_at DESC; a
+        # backward scan of this index serves that, and per-post comment counts.
+        Index("ix_comments_post_score_created", "post_id", "score", "created_at"),
+    )
 
 
 class Vote(Base):
@@ -149,6 +160,9 @@ class Portfolio(Base):
     
     # Positions as JSON string: [{"ticker": "TSLA", "shares": 100, "avg_cost": 200, "current": 250, "gain_pct": 25}]
     positions_json = Column(Text, nullable=True)
+    # Derived from positions at write time so cards don't parse the JSON
+    positions_preview = Column(Text, nullable=True)  # "AAPL, TSLA, NVDA +2 more"
+    positions_count = Column(Integer, default=0)
     
     # Optional note
     note = Column(Text, nullable=True)
@@ -6,18 +6,16 @@ import asyncio
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, Path
 from fastapi.security import HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
 from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..models import Agent, Post, Comment, Vote, Follow, KarmaHistory
 from ..schemas import (
-    AgentRegister, AgentUpdate, AgentResponse, RegisterResponse, LoginRequest,
+    AgentRegister, AgentUpdate, AgentResponse, RegisterResponse, LoginRequest, LoginResponse, LoginAgent,
     AgentStatsResponse, ActivityResponse, FollowResponse, PostResponse, CommentResponse,
 )
-from ..helpers import sanitize, require_agent, generate_avatar_url
+from ..helpers import sanitize, require_agent, get_agent_from_key, generate_avatar_url, bump_feed_version
 from ..auth import generate_api_key, generate_claim_code, hash_api_key, security
 
 router = APIRouter(prefix="/api/v1", tags=["agents"])
@@ -39,6 +37,9 @@ async def register_agent(request: Request, response: Response, data: AgentRegist
         claim_code=claim_code,
     )
     db.add(agent)
+    db.flush()
+    if not agent.avatar_url:
+        agent.avatar_url = generate_avatar_url(agent.id)
     db.commit()
     db.refresh(agent)
 
@@ -61,7 +62,8 @@ async def register_agent(request: Request, response: Response, data: AgentRegist
         claim_code=claim_code,
     )
 
-    resp = JSONResponse(content=jsonable_encoder(result))
+    # pydantic-core writes the JSON bytes directly; no jsonable_encoder + json.dumps pass
+    resp = Response(content=result.model_dump_json(), media_type="application/json")
     resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
     resp.headers["Pragma"] = "no-cache"
     resp.set_cookie(
@@ -75,13 +77,9 @@ async def register_agent(request: Request, response: Response, data: AgentRegist
     return resp
 
 
-@router.post("/login")
+@router.post("/login", response_model=LoginResponse)
 async def login_api(response: Response, data: LoginRequest, db: Session = Depends(get_db)):
-    hashed_key = hash_api_key(data.api_key)
-    agent = db.query(Agent).filter(Agent.api_key == hashed_key).first()
-    if not agent:
-        agent = db.query(Agent).filter(Agent.api_key == data.api_key).first()
-
+    agent = get_agent_from_key(data.api_key, db)
     if not agent:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
@@ -93,7 +91,7 @@ async def login_api(response: Response, data: LoginRequest, db: Session = Depend
         samesite="strict",
         max_age=30 * 24 * 60 * 60
     )
-    return {"message": "Logged in successfully", "agent": {"id": agent.id, "name": agent.name}}
+    return LoginResponse(agent=LoginAgent(id=agent.id, name=agent.name))
 
 
 @router.post("/logout")
@@ -137,8 +135,9 @@ async def update_me(
     if data.description is not None:
         agent.description = data.description
     if data.avatar_url is not None:
-        agent.avatar_url = data.avatar_url
+        agent.avatar_url = data.avatar_url or generate_avatar_url(agent.id)
     db.commit()
+    bump_feed_version()
     db.refresh(agent)
     return AgentResponse(
         id=agent.id,
@@ -52,15 +52,18 @@ async def get_leaderboard(
         cutoff = None
 
     if cutoff:
-        agents = db.query(Agent).all()
-        agent_data = []
-        for agent in agents:
-            period_posts = db.query(Post).filter(Post.agent_id == agent.id, Post.created_at >= cutoff).all()
-            period_karma = sum(p.score for p in period_posts)
-            period_post_count = len(period_posts)
-            if period_karma == 0 and period_post_count == 0:
-                continue
-            agent_data.append({"agent": agent, "period_karma": period_karma, "period_posts": period_post_count})
+        # One GROUP BY over the period instead of loading every post per agent
+        period_stats = {
+            agent_id: (period_karma or 0, period_post_count)
+            for agent_id, period_karma, period_post_count in db.query(
+                Post.agent_id, func.sum(Post.score), func.count(Post.id)
+            ).filter(Post.created_at >= cutoff).group_by(Post.agent_id)
+        }
+        agents = db.query(Agent).filter(Agent.id.in_(period_stats)).order_by(Agent.id).all() if period_stats else []
+        agent_data = [
+            {"agent": agent, "period_karma": period_stats[agent.id][0], "period_posts": period_stats[agent.id][1]}
+            for agent in agents
+        ]
 
         if sort == "karma":
             agent_data.sort(key=lambda x: x["period_karma"], reverse=True)
@@ -105,7 +108,7 @@ async def get_leaderboard(
 
         result.append(LeaderboardAgent(
             rank=i + 1, id=agent.id, name=agent.name,
-            avatar_url=agent.avatar_url or generate_avatar_url(agent.name, agent.id),
+            avatar_url=agent.avatar_url or generate_avatar_url(agent.id),
             karma=agent.karma, win_rate=agent.win_rate or 0.0,
             total_gain_pct=agent.total_gain_loss_pct or 0.0, total_trades=agent.total_trades,
             recent_activity=recent_activity,
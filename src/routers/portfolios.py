@@ -1,9 +1,9 @@
 """
 ClawStreetBots - Portfolio API Routes
 """
-import json
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy import desc
@@ -12,7 +12,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Portfolio
 from ..schemas import PortfolioCreate, PortfolioResponse
-from ..helpers import require_agent
+from ..helpers import require_agent, bump_feed_version, positions_preview
 from ..auth import security
 
 router = APIRouter(prefix="/api/v1", tags=["portfolios"])
@@ -29,8 +29,13 @@ async def create_portfolio(
     agent = require_agent(credentials, request, db)
 
     positions_json = None
+    preview = None
+    count = 0
     if data.positions:
-        positions_json = json.dumps([p.model_dump() for p in data.positions])
+        positions = [p.model_dump() for p in data.positions]
+        positions_json = orjson.dumps(positions).decode()
+        preview = positions_preview(positions)
+        count = len(positions)
 
     portfolio = Portfolio(
         agent_id=agent.id,
@@ -41,13 +46,16 @@ async def create_portfolio(
         total_gain_pct=data.total_gain_pct,
         total_gain_usd=data.total_gain_usd,
         positions_json=positions_json,
+        positions_preview=preview,
+        positions_count=count,
         note=data.note,
     )
     db.add(portfolio)
     db.commit()
+    bump_feed_version()
     db.refresh(portfolio)
 
-    positions = json.loads(portfolio.positions_json) if portfolio.positions_json else None
+    positions = orjson.loads(portfolio.positions_json) if portfolio.positions_json else None
 
     return PortfolioResponse(
         id=portfolio.id,
@@ -82,7 +90,7 @@ async def get_portfolios(
     for p in portfolios:
         if not p.agent:
             continue  # skip orphaned portfolios
-        positions = json.loads(p.positions_json) if p.positions_json else None
+        positions = orjson.loads(p.positions_json) if p.positions_json else None
         result.append(PortfolioResponse(
             id=p.id,
             agent_id=p.agent_id,
@@ -13,7 +13,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Agent, Post, Comment, Vote, Submolt
 from ..schemas import PostCreate, PostResponse, CommentCreate, CommentResponse
-from ..helpers import sanitize, require_agent
+from ..helpers import sanitize, require_agent, bump_feed_version
 from ..auth import security
 from ..websocket import broadcast_new_post, broadcast_post_vote, broadcast_new_comment
 
@@ -71,6 +71,7 @@ async def create_post(
             agent.win_rate = 0.0
 
     db.commit()
+    bump_feed_version()
     db.refresh(post)
 
     # Broadcast new post to WebSocket clients
@@ -255,6 +256,7 @@ async def upvote_post(
         db.add(Vote(agent_id=agent.id, post_id=post_id, vote=1))
 
     db.commit()
+    bump_feed_version()
 
     # Broadcast vote update to WebSocket clients
     asyncio.create_task(broadcast_post_vote(post_id, post.score, post.upvotes, post.downvotes))
@@ -299,6 +301,7 @@ async def downvote_post(
         db.add(Vote(agent_id=agent.id, post_id=post_id, vote=-1))
 
     db.commit()
+    bump_feed_version()
 
     # Broadcast vote update to WebSocket clients
     asyncio.create_task(broadcast_post_vote(post_id, post.score, post.upvotes, post.downvotes))
@@ -336,6 +339,7 @@ async def create_comment(
     )
     db.add(comment)
     db.commit()
+    bump_feed_version()
     db.refresh(comment)
 
     # Broadcast new comment to WebSocket clients
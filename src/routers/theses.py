@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Thesis
 from ..schemas import ThesisCreate, ThesisResponse
-from ..helpers import require_agent
+from ..helpers import require_agent, bump_feed_version
 from ..auth import security
 
 router = APIRouter(prefix="/api/v1", tags=["theses"])
@@ -43,6 +43,7 @@ async def create_thesis(
     )
     db.add(thesis)
     db.commit()
+    bump_feed_version()
     db.refresh(thesis)
 
     return ThesisResponse(
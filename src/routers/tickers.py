@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 from sqlalchemy.orm import Session
 
 from ..database import get_db
@@ -17,6 +17,18 @@ from ..schemas import (
 
 router = APIRouter(prefix="/api/v1", tags=["tickers"])
 
+# Ticker aggregation scans many posts but only needs these columns; fetching them
+# as plain rows with yield_per skips ORM instantiation and streams in batches.
+_TICKER_SCAN_COLUMNS = (Post.tickers, Post.score, Post.gain_loss_pct, Post.position_type, Post.created_at)
+
+
+def _scan_ticker_posts(db: Session, *criteria):
+    return db.execute(
+        select(*_TICKER_SCAN_COLUMNS)
+        .where(Post.tickers.isnot(None), Post.tickers != "", *criteria)
+        .execution_options(yield_per=1000)
+    )
+
 
 def parse_tickers_from_posts(posts) -> dict:
     """Parse comma-separated tickers from posts and count occurrences"""
@@ -53,8 +65,7 @@ async def list_tickers(
     db: Session = Depends(get_db)
 ):
     """List all mentioned tickers with post counts"""
-    posts = db.query(Post).filter(Post.tickers.isnot(None), Post.tickers != "").all()
-    ticker_data = parse_tickers_from_posts(posts)
+    ticker_data = parse_tickers_from_posts(_scan_ticker_posts(db))
     tickers = [
         TickerSummary(ticker=t, post_count=d["post_count"], latest_post_at=d["latest_post_at"])
         for t, d in ticker_data.items()
@@ -116,10 +127,7 @@ async def get_trending_tickers(
 ):
     """Get trending tickers with sentiment analysis."""
     cutoff = datetime.utcnow() - timedelta(hours=hours)
-    posts = db.query(Post).filter(
-        Post.created_at >= cutoff, Post.tickers.isnot(None), Post.tickers != ""
-    ).all()
-    return _build_trending(posts, limit)
+    return _build_trending(_scan_ticker_posts(db, Post.created_at >= cutoff), limit)
 
 
 @router.get("/trending", response_model=list[TrendingTickerResponse])
@@ -130,10 +138,7 @@ async def get_trending(
 ):
     """Get trending tickers (legacy endpoint)."""
     cutoff = datetime.utcnow() - timedelta(hours=hours)
-    posts = db.query(Post).filter(
-        Post.created_at >= cutoff, Post.tickers.isnot(None), Post.tickers != ""
-    ).all()
-    return _build_trending(posts, limit)
+    return _build_trending(_scan_ticker_posts(db, Post.created_at >= cutoff), limit)
 
 
 @router.get("/tickers/{ticker}", response_model=TickerResponse)
@@ -72,6 +72,16 @@ class LoginRequest(BaseModel):
     api_key: str
 
 
+class LoginAgent(BaseModel):
+    id: int
+    name: str
+
+
+class LoginResponse(BaseModel):
+    message: str = "Logged in successfully"
+    agent: LoginAgent
+
+
 class AgentStatsResponse(BaseModel):
     agent_id: int
     karma: int
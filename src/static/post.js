@@ -0,0 +1,187 @@
+// Post page: voting, comments and replies. The page sets window.POST_ID.
+const postId = window.POST_ID;
+
+let apiKey = localStorage.getItem('csb_api_key') || '';
+const isLoggedIn = localStorage.getItem('csb_agent_id') !== null;
+
+// Show API key banner if not set
+function checkApiKey() {
+    if (!apiKey && !isLoggedIn) {
+        document.getElementById('api-key-banner').classList.remove('hidden');
+    }
+}
+checkApiKey();
+
+async function saveApiKey() {
+    const input = document.getElementById('api-key-input');
+    apiKey = input.value.trim();
+    if (apiKey) {
+        try {
+            const res = await fetch('/api/v1/login', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ api_key: apiKey })
+            });
+            if (res.ok) {
+                const data = await res.json();
+                localStorage.setItem('csb_agent_name', data.agent.name);
+                localStorage.setItem('csb_agent_id', data.agent.id);
+                document.getElementById('api-key-banner').classList.add('hidden');
+                showToast('API key saved! 🔑');
+                setTimeout(() => location.reload(), 500);
+            }
+        } catch (e) {}
+    }
+}
+
+function showToast(msg, isError = false) {
+    const toast = document.createElement('div');
+    toast.className = `fixed bottom-4 right-4 px-6 py-3 rounded-lg font-semibold ${isError ? 'bg-red-600' : 'bg-green-600'}`;
+    toast.textContent = msg;
+    document.body.appendChild(toast);
+    setTimeout(() => toast.remove(), 3000);
+}
+
+function showError(msg) {
+    const err = document.getElementById('comment-error');
+    err.textContent = msg;
+    err.classList.remove('hidden');
+    setTimeout(() => err.classList.add('hidden'), 5000);
+}
+
+async function vote(direction) {
+    if (!apiKey && !isLoggedIn) {
+        document.getElementById('api-key-banner').classList.remove('hidden');
+        showToast('Please set your API key first', true);
+        return;
+    }
+
+    const endpoint = direction === 'up' ? 'upvote' : 'downvote';
+    try {
+        const headers = {};
+        if (apiKey) headers['Authorization'] = `Bearer ${apiKey}`;
+
+        const res = await fetch(`/api/v1/posts/${postId}/${endpoint}`, {
+            method: 'POST',
+            headers: headers
+        });
+
+        if (!res.ok) {
+            const data = await res.json();
+            throw new Error(data.detail || 'Vote failed');
+        }
+
+        const data = await res.json();
+        document.getElementById('score').textContent = data.score;
+        showToast(direction === 'up' ? '⬆️ Upvoted!' : '⬇️ Downvoted!');
+    } catch (e) {
+        showToast(e.message, true);
+    }
+}
+
+function replyTo(commentId, agentName) {
+    document.getElementById('parent-id').value = commentId;
+    document.getElementById('replying-to').classList.remove('hidden');
+    document.getElementById('replying-to-name').textContent = agentName;
+    document.getElementById('comment-form-title').textContent = '💬 Reply to Comment';
+    document.getElementById('comment-content').focus();
+    document.getElementById('comment-content').scrollIntoView({ behavior: 'smooth', block: 'center' });
+}
+
+function cancelReply() {
+    document.getElementById('parent-id').value = '';
+    document.getElementById('replying-to').classList.add('hidden');
+    document.getElementById('comment-form-title').textContent = '💬 Add a Comment';
+}
+
+async function submitComment() {
+    if (!apiKey && !isLoggedIn) {
+        document.getElementById('api-key-banner').classList.remove('hidden');
+        showToast('Please set your API key first', true);
+        return;
+    }
+
+    const content = document.getElementById('comment-content').value.trim();
+    if (!content) {
+        showError('Comment cannot be empty');
+        return;
+    }
+
+    const parentId = document.getElementById('parent-id').value || null;
+    const btn = document.getElementById('submit-btn');
+    btn.disabled = true;
+    btn.textContent = 'Posting...';
+
+    try {
+        const headers = {
+            'Content-Type': 'application/json'
+        };
+        if (apiKey) headers['Authorization'] = `Bearer ${apiKey}`;
+
+        const res = await fetch(`/api/v1/posts/${postId}/comments`, {
+            method: 'POST',
+            headers: headers,
+            body: JSON.stringify({
+                content: content,
+                parent_id: parentId ? parseInt(parentId) : null
+            })
+        });
+
+        if (!res.ok) {
+            const data = await res.json();
+            throw new Error(data.detail || 'Failed to post comment');
+        }
+
+        showToast('Comment posted! 🎉');
+        // Reload page to show new comment
+        setTimeout(() => location.reload(), 500);
+    } catch (e) {
+        showError(e.message);
+        btn.disabled = false;
+        btn.textContent = 'Post Comment';
+    }
+}
+
+// Auth nav handling
+function updateNav() {
+    const apiKey = localStorage.getItem('csb_api_key');
+    const agentName = localStorage.getItem('csb_agent_name');
+    const agentId = localStorage.getItem('csb_agent_id');
+    const authNav = document.getElementById('auth-nav');
+
+    if (agentName && agentId) {
+        authNav.textContent = '';
+        const link = document.createElement('a');
+        link.href = '/agent/' + encodeURIComponent(agentId);
+        link.className = 'text-green-400 hover:text-green-300 font-semibold';
+        link.textContent = '🤖 ' + agentName;
+        const btn = document.createElement('button');
+        btn.className = 'bg-red-600 hover:bg-red-700 px-3 py-1 rounded text-sm';
+        btn.textContent = 'Logout';
+        btn.addEventListener('click', logout);
+        authNav.appendChild(link);
+        authNav.appendChild(btn);
+    } else {
+        authNav.innerHTML = `
+            <a href="/login" class="hover:text-green-500">Login</a>
+            <a href="/register" class="bg-green-600 hover:bg-green-700 px-3 py-1 rounded">Register</a>
+        `;
+    }
+}
+
+async function logout() {
+    try { await fetch('/api/v1/logout', {method: 'POST'}); } catch (e) {}
+    localStorage.removeItem('csb_api_key');
+    localStorage.removeItem('csb_agent_name');
+    localStorage.removeItem('csb_agent_id');
+    window.location.href = '/';
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    updateNav();
+    document.querySelectorAll('.reply-btn').forEach(btn => {
+        btn.addEventListener('click', () => {
+            replyTo(btn.dataset.commentId, btn.dataset.agentName);
+        });
+    });
+});